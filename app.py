@@ -2,8 +2,10 @@ from flask import Flask, render_template, jsonify, request
 from flask_cors import CORS
 from data.mock_data import get_student_data
 from session_module.session_endpoints import register_session_routes
+from session_module.json_provider import ORJSONProvider
 
 app = Flask(__name__)
+app.json = ORJSONProvider(app)  # Serialização JSON via orjson (com fallback)
 CORS(app)  # Habilitar CORS para integração com Inven!RA
 
 # ========================================
@@ -18,7 +18,7 @@ Autor: Fábio Amado (2501444)
 """
 
 from session_module.components.session_manager import SessionManager
-from session_module.components.event_tracker import EventTracker
+from session_module.components.event_tracker import EventTracker, Interaction
 from session_module.components.statistics_calculator import StatisticsCalculator
 from session_module.components.streak_manager import StreakManager
 from session_module.components.analytics_exporter import AnalyticsExporter
@@ -26,6 +26,7 @@ from session_module.components.analytics_exporter import AnalyticsExporter
 __all__ = [
     'SessionManager',
     'EventTracker',
+    'Interaction',
     'StatisticsCalculator',
     'StreakManager',
     'AnalyticsExporter'
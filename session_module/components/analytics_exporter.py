@@ -33,33 +33,49 @@ class AnalyticsExporter:
         Returns:
             Dados formatados para Inven!RA
         """
+        return self.wrap_export(user_id, self.build_metrics(user_stats))
+
+    def build_metrics(self, user_stats: Optional[Dict]) -> Dict:
+        """
+        Calcula as métricas de sessão (parte cacheável da exportação).
+
+        Args:
+            user_stats: Estatísticas do utilizador (ou None)
+
+        Returns:
+            Métricas no formato Inven!RA (vazio se não houver dados)
+        """
         if user_stats is None:
-            return self._empty_export(user_id)
+            return {}
 
         return {
-            'studentId': user_id,
-            'activityId': self.ACTIVITY_ID,
-            'sessionMetrics': {
-                'totalSessions': user_stats['total_sessions'],
-                'totalPlayTime': user_stats['total_play_time'],
-                'totalChallenges': user_stats['total_challenges'],
-                'totalInteractions': user_stats['total_interactions'],
-                'consecutiveDays': user_stats['consecutive_days'],
-                'avgSessionTime': self._calculate_avg_session_time(user_stats),
-                # Strategy Pattern
-                'totalScore': user_stats.get('total_score', 0),
-                'avgScore': round(user_stats.get('avg_score', 0.0), 2),
-                'bestStreak': user_stats.get('best_streak', 0)
-            },
-            'timestamp': datetime.now().isoformat()
+            'totalSessions': user_stats['total_sessions'],
+            'totalPlayTime': user_stats['total_play_time'],
+            'totalChallenges': user_stats['total_challenges'],
+            'totalInteractions': user_stats['total_interactions'],
+            'consecutiveDays': user_stats['consecutive_days'],
+            'avgSessionTime': self._calculate_avg_session_time(user_stats),
+            # Strategy Pattern
+            'totalScore': user_stats.get('total_score', 0),
+            'avgScore': round(user_stats.get('avg_score', 0.0), 2),
+            'bestStreak': user_stats.get('best_streak', 0)
         }
 
-    def _empty_export(self, user_id: str) -> Dict:
-        """Retorna estrutura vazia para utilizador sem dados."""
+    def wrap_export(self, user_id: str, session_metrics: Dict) -> Dict:
+        """
+        Envolve métricas no envelope Inven!RA com timestamp atual.
+
+        Args:
+            user_id: Identificador do utilizador
+            session_metrics: Métricas calculadas por build_metrics
+
+        Returns:
+            Dados formatados para Inven!RA
+        """
         return {
             'studentId': user_id,
             'activityId': self.ACTIVITY_ID,
-            'sessionMetrics': {},
+            'sessionMetrics': session_metrics,
             'timestamp': datetime.now().isoformat()
         }
 
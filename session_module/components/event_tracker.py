@@ -6,10 +6,46 @@ Responsabilidade Única: Registar eventos (desafios, interações).
 Autor: Fábio Amado (2501444)
 """
 from typing import Dict, Optional, Any
-from datetime import datetime
+import time
 from models.challenge import Challenge
 
 
+class Interaction:
+    """
+    Interação registada numa sessão.
+
+    Usa __slots__ (sem __dict__ por instância): as interações são os
+    objetos mais numerosos do módulo. Campos não aplicáveis ao tipo
+    de evento ficam a None.
+    """
+
+    __slots__ = (
+        'type', 'timestamp', 'challenge_id', 'challenge_type', 'animal_id',
+        'start_time_mono', 'is_correct', 'score', 'performance', 'data'
+    )
+
+    def __init__(self, type: str, timestamp: float,
+                 challenge_id: Optional[str] = None,
+                 challenge_type: Optional[str] = None,
+                 animal_id: Optional[int] = None,
+                 start_time_mono: Optional[float] = None,
+                 is_correct: Optional[bool] = None,
+                 score: Optional[int] = None,
+                 performance: Optional[str] = None,
+                 data: Optional[Dict] = None):
+        """Inicializa uma interação."""
+        self.type = type
+        self.timestamp = timestamp
+        self.challenge_id = challenge_id
+        self.challenge_type = challenge_type
+        self.animal_id = animal_id
+        self.start_time_mono = start_time_mono
+        self.is_correct = is_correct
+        self.score = score
+        self.performance = performance
+        self.data = data
+
+
 class EventTracker:
     """
     Regista eventos de desafios e interações.
@@ -30,26 +66,25 @@ class EventTracker:
             session: Dados da sessão (modificado in-place)
             challenge: Instância do desafio
         """
-        interaction = {
-            'type': 'challenge_start',
-            'challenge_id': challenge.challenge_id,
-            'challenge_type': challenge.get_challenge_type(),
-            'animal_id': challenge.animal_id,
-            'timestamp': datetime.now().isoformat(),
-            'start_time': datetime.now()
-        }
+        interaction = Interaction(
+            type='challenge_start',
+            challenge_id=challenge.challenge_id,
+            challenge_type=challenge.get_challenge_type(),
+            animal_id=challenge.animal_id,
+            # Epoch (wall-clock) e relógio monotónico para durações
+            timestamp=time.time(),
+            start_time_mono=time.monotonic()
+        )
 
-        session['interactions'].append(interaction)
+        self._append_interaction(session, interaction)
+        session['challenge_starts'][challenge.challenge_id] = interaction
         session['challenges_attempted'] += 1
 
-        # Inicializar tracking de tentativas
-        if challenge.challenge_id not in session['current_challenge_attempts']:
-            session['current_challenge_attempts'][challenge.challenge_id] = 0
-
     def log_challenge_complete(self, session: Dict,
                               challenge_id: str,
                               is_correct: bool,
-                              score_result: Dict) -> float:
+                              score_result: Dict,
+                              duration: float) -> None:
         """
         Regista conclusão de um desafio.
 
@@ -58,62 +93,98 @@ class EventTracker:
             challenge_id: ID do desafio
             is_correct: Se resposta estava correta
             score_result: Resultado do cálculo de pontuação
-
-        Returns:
-            Duração do desafio em segundos
+            duration: Duração medida por get_challenge_duration (a mesma
+                usada no cálculo da pontuação)
         """
         # Encontrar interação de início
         start_interaction = self._find_challenge_start(
             session, challenge_id
         )
 
-        duration = 0
         if start_interaction:
-            end_time = datetime.now()
-            duration = (end_time - start_interaction['start_time']).total_seconds()
-
-            session['challenge_times'].append({
-                'challenge_id': challenge_id,
-                'challenge_type': start_interaction['challenge_type'],
-                'duration': duration,
-                'is_correct': is_correct,
-                'attempts': session['current_challenge_attempts'].get(
-                    challenge_id, 1
-                ),
-                'score': score_result.get('score', 0),
-                'performance': score_result.get('performance', 'poor')
-            })
+            session['sum_challenge_time'] += duration
+
+            session['ct_ids'].append(challenge_id)
+            session['ct_types'].append(start_interaction.challenge_type)
+            session['ct_duration'].append(duration)
+            session['ct_correct'].append(is_correct)
+            session['ct_attempts'].append(
+                session['current_challenge_attempts'].get(challenge_id, 1)
+            )
+            session['ct_score'].append(score_result.get('score', 0))
+            session['ct_performance'].append(
+                score_result.get('performance', 'poor')
+            )
 
         # Registar interação de conclusão
-        interaction = {
-            'type': 'challenge_complete',
-            'challenge_id': challenge_id,
-            'is_correct': is_correct,
-            'timestamp': datetime.now().isoformat(),
-            'score': score_result.get('score', 0),
-            'performance': score_result.get('performance', 'poor')
-        }
-        session['interactions'].append(interaction)
-
-        return duration
+        interaction = Interaction(
+            type='challenge_complete',
+            challenge_id=challenge_id,
+            is_correct=is_correct,
+            timestamp=time.time(),
+            score=score_result.get('score', 0),
+            performance=score_result.get('performance', 'poor')
+        )
+        self._append_interaction(session, interaction)
 
     def log_interaction(self, session: Dict,
                        event_type: str,
-                       event_data: Optional[Dict] = None) -> None:
+                       event_data: Optional[Dict] = None) -> int:
         """
-        Regista uma interação genérica.
+        Regista uma interação genérica (diferida até flush_pending).
 
         Args:
             session: Dados da sessão (modificado in-place)
             event_type: Tipo do evento
             event_data: Dados adicionais
+
+        Returns:
+            Número de interações pendentes na sessão
         """
-        interaction = {
-            'type': event_type,
-            'timestamp': datetime.now().isoformat(),
-            'data': event_data or {}
-        }
-        session['interactions'].append(interaction)
+        pending = session['_pending']
+        pending.append((time.time(), event_type, event_data))
+        return len(pending)
+
+    def flush_pending(self, session: Dict) -> int:
+        """
+        Consolida as interações genéricas pendentes numa só passagem.
+
+        Args:
+            session: Dados da sessão (modificado in-place)
+
+        Returns:
+            Número de interações consolidadas
+        """
+        pending = session['_pending']
+        if not pending:
+            return 0
+
+        interactions = session['interactions']
+        counts = session['interaction_counts']
+        for timestamp, event_type, event_data in pending:
+            interactions.append(Interaction(
+                type=event_type,
+                timestamp=timestamp,
+                data=event_data or {}
+            ))
+            counts[event_type] += 1
+
+        flushed = len(pending)
+        pending.clear()
+        return flushed
+
+    def get_challenge_duration(self, session: Dict,
+                               challenge_id: str) -> float:
+        """
+        Mede o tempo decorrido desde o início de um desafio.
+
+        Returns:
+            Duração em segundos (0 se o desafio não foi iniciado)
+        """
+        start_interaction = self._find_challenge_start(session, challenge_id)
+        if start_interaction is None:
+            return 0
+        return time.monotonic() - start_interaction.start_time_mono
 
     def increment_attempts(self, session: Dict, challenge_id: str) -> int:
         """
@@ -122,15 +193,17 @@ class EventTracker:
         Returns:
             Número de tentativas atual
         """
-        attempts = session['current_challenge_attempts'].get(challenge_id, 0) + 1
-        session['current_challenge_attempts'][challenge_id] = attempts
-        return attempts
+        attempts = session['current_challenge_attempts']
+        attempts[challenge_id] += 1
+        return attempts[challenge_id]
+
+    def _append_interaction(self, session: Dict,
+                           interaction: Interaction) -> None:
+        """Regista interação e atualiza contagem por tipo."""
+        session['interactions'].append(interaction)
+        session['interaction_counts'][interaction.type] += 1
 
     def _find_challenge_start(self, session: Dict,
-                             challenge_id: str) -> Optional[Dict]:
-        """Encontra interação de início de um desafio."""
-        for interaction in reversed(session['interactions']):
-            if (interaction['type'] == 'challenge_start' and
-                interaction['challenge_id'] == challenge_id):
-                return interaction
-        return None
+                             challenge_id: str) -> Optional[Interaction]:
+        """Encontra interação de início de um desafio (lookup O(1))."""
+        return session['challenge_starts'].get(challenge_id)
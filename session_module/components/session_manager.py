@@ -7,6 +7,9 @@ Autor: Fábio Amado (2501444)
 """
 from typing import Dict, List, Optional
 from datetime import datetime
+import secrets
+import time
+from collections import defaultdict, deque
 
 
 class SessionManager:
@@ -20,6 +23,10 @@ class SessionManager:
     - Manter referências user_id -> session_ids
     """
 
+    # Histórico máximo de interações por sessão (as mais antigas são
+    # descartadas; contagens ficam em 'interaction_counts')
+    MAX_INTERACTIONS = 1000
+
     def __init__(self):
         """Inicializa o gestor de sessões."""
         # {session_id: {dados da sessão}}
@@ -40,21 +47,40 @@ class SessionManager:
             ID da sessão criada
         """
         if session_id is None:
-            session_id = f"{user_id}_{datetime.now().strftime('%Y%m%d%H%M%S')}"
+            # Sufixo aleatório: sem colisões entre sessões no mesmo segundo
+            session_id = f"{user_id}_{secrets.token_hex(6)}"
 
         self.sessions[session_id] = {
             'session_id': session_id,
             'user_id': user_id,
             'start_time': datetime.now().isoformat(),
+            # Relógio monotónico para a duração (evita re-parse do ISO)
+            '_start_mono': time.monotonic(),
             'end_time': None,
             'duration': 0,
             'challenges_attempted': 0,
-            'interactions': [],
-            'challenge_times': [],
+            'interactions': deque(maxlen=self.MAX_INTERACTIONS),
+            # Interações genéricas por consolidar: (timestamp, tipo, dados)
+            '_pending': [],
+            # {challenge_id: challenge_start mais recente} - todos os desafios
+            # iniciados na sessão; não é limpo na conclusão (tentativas
+            # repetidas continuam a encontrar o tempo de início)
+            'challenge_starts': {},
+            # Tempos por desafio em colunas paralelas (um índice por conclusão)
+            'ct_ids': [],
+            'ct_types': [],
+            'ct_duration': [],
+            'ct_correct': [],
+            'ct_attempts': [],
+            'ct_score': [],
+            'ct_performance': [],
+            # Agregados incrementais (evitam recontagem no sumário)
+            'interaction_counts': defaultdict(int),
+            'sum_challenge_time': 0.0,
             'active': True,
             # Campos para scoring (Strategy Pattern)
             'current_streak': 0,
-            'current_challenge_attempts': {},
+            'current_challenge_attempts': defaultdict(int),
             'scores': [],
             'total_score': 0
         }
@@ -88,12 +114,8 @@ class SessionManager:
             return session
 
         # Calcular duração
-        start = datetime.fromisoformat(session['start_time'])
-        end = datetime.now()
-        duration = (end - start).total_seconds()
-
-        session['end_time'] = end.isoformat()
-        session['duration'] = duration
+        session['end_time'] = datetime.now().isoformat()
+        session['duration'] = time.monotonic() - session['_start_mono']
         session['active'] = False
 
         return session
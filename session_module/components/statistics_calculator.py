@@ -38,7 +38,6 @@ class StatisticsCalculator:
                 'total_interactions': 0,
                 'consecutive_days': 0,
                 'last_play_date': None,
-                'play_dates': [],
                 # Strategy Pattern
                 'total_score': 0,
                 'best_streak': 0,
@@ -57,6 +56,18 @@ class StatisticsCalculator:
         """Incrementa contador de interações do utilizador."""
         self.user_stats[user_id]['total_interactions'] += 1
 
+    def bulk_add(self, user_id: str, deltas: Dict[str, float]) -> None:
+        """
+        Soma vários deltas às estatísticas do utilizador de uma só vez.
+
+        Args:
+            user_id: Identificador do utilizador
+            deltas: {campo: incremento}
+        """
+        stats = self.user_stats[user_id]
+        for field, delta in deltas.items():
+            stats[field] += delta
+
     def update_play_time(self, user_id: str, duration: float) -> None:
         """Adiciona tempo de jogo ao total do utilizador."""
         self.user_stats[user_id]['total_play_time'] += duration
@@ -94,29 +105,22 @@ class StatisticsCalculator:
         Returns:
             Sumário da sessão
         """
-        # Tempo médio por desafio
+        # Tempo médio por desafio (soma mantida pelo EventTracker)
         avg_challenge_time = 0
-        if session['challenge_times']:
-            total_time = sum(
-                ct['duration'] for ct in session['challenge_times']
+        if session['ct_duration']:
+            avg_challenge_time = (
+                session['sum_challenge_time'] / len(session['ct_duration'])
             )
-            avg_challenge_time = total_time / len(session['challenge_times'])
-
-        # Contagem de interações por tipo
-        interaction_counts = {}
-        for interaction in session['interactions']:
-            itype = interaction['type']
-            interaction_counts[itype] = interaction_counts.get(itype, 0) + 1
 
         return {
             'session_id': session['session_id'],
             'user_id': session['user_id'],
             'duration': session['duration'],
             'challenges_attempted': session['challenges_attempted'],
-            'total_interactions': len(session['interactions']),
-            'interaction_breakdown': interaction_counts,
+            'total_interactions': sum(session['interaction_counts'].values()),
+            'interaction_breakdown': dict(session['interaction_counts']),
             'avg_challenge_time': round(avg_challenge_time, 2),
-            'challenge_times': session['challenge_times'],
+            'challenge_times': self._build_challenge_times(session),
             'start_time': session['start_time'],
             'end_time': session['end_time'],
             'active': session['active'],
@@ -126,6 +130,27 @@ class StatisticsCalculator:
             'scores': session.get('scores', [])
         }
 
+    def _build_challenge_times(self, session: Dict) -> List[Dict]:
+        """Reconstrói a lista de tempos por desafio a partir das colunas."""
+        return [
+            {
+                'challenge_id': challenge_id,
+                'challenge_type': challenge_type,
+                'duration': duration,
+                'is_correct': is_correct,
+                'attempts': attempts,
+                'score': score,
+                'performance': performance
+            }
+            for (challenge_id, challenge_type, duration, is_correct,
+                 attempts, score, performance) in zip(
+                session['ct_ids'], session['ct_types'],
+                session['ct_duration'], session['ct_correct'],
+                session['ct_attempts'], session['ct_score'],
+                session['ct_performance']
+            )
+        ]
+
     def calculate_user_report(self, user_id: str,
                              sessions_data: List[Dict]) -> Dict:
         """
@@ -6,7 +6,7 @@ Responsabilidade Única: Gerir dias consecutivos e streaks de acertos.
 Autor: Fábio Amado (2501444)
 """
 from typing import Dict
-from datetime import datetime
+from datetime import datetime, date
 
 
 class StreakManager:
@@ -28,15 +28,9 @@ class StreakManager:
         """
         today = datetime.now().date()
 
-        # Adicionar data de hoje
-        if today not in user_stats['play_dates']:
-            user_stats['play_dates'].append(today)
-
-        # Calcular dias consecutivos
+        # Calcular dias consecutivos por diferença de dias de calendário
         if user_stats['last_play_date']:
-            last_date = datetime.fromisoformat(
-                user_stats['last_play_date']
-            ).date()
+            last_date = date.fromisoformat(user_stats['last_play_date'])
             diff = (today - last_date).days
 
             if diff == 1:
@@ -62,10 +56,9 @@ class StreakManager:
         Returns:
             Streak atual
         """
-        if is_correct:
-            session['current_streak'] += 1
-        else:
-            session['current_streak'] = 0
+        # Sem ramificação: (streak + 1) se correto, 0 caso contrário
+        correct = int(bool(is_correct))
+        session['current_streak'] = (session['current_streak'] + correct) * correct
 
         return session['current_streak']
 
@@ -0,0 +1,65 @@
+"""
+JSON Provider baseado em orjson - Módulo de Sessões.
+
+Serializa as respostas JSON (sumários, relatórios, exportações Inven!RA)
+com orjson, que escreve bytes UTF-8 diretamente. Se orjson não estiver
+instalado, mantém o comportamento do provider por defeito do Flask.
+
+Autor: Fábio Amado (2501444@estudante.uab.pt)
+"""
+from typing import Any
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - fallback para json da stdlib
+    orjson = None
+
+
+class ORJSONProvider(DefaultJSONProvider):
+    """
+    Provider JSON do Flask que usa orjson quando disponível.
+
+    Usado por jsonify() em todos os endpoints, sem alterar o código
+    das rotas. Apenas a serialização muda: o parsing dos pedidos
+    (request.get_json) continua no json da stdlib. datetime/date
+    continuam a ser serializados pelo default() do Flask, e valores que
+    o orjson não suporta (ex.: inteiros > 64 bits) usam a stdlib.
+    """
+
+    def _options(self) -> int:
+        """Opções orjson equivalentes à configuração do provider."""
+        option = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return option
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        """Serializa obj para string JSON."""
+        # Argumentos do chamador (indent, sort_keys, default...) só são
+        # suportados pelo json da stdlib
+        if orjson is None or kwargs:
+            return super().dumps(obj, **kwargs)
+        try:
+            return orjson.dumps(
+                obj, default=self.default, option=self._options()
+            ).decode()
+        except orjson.JSONEncodeError:
+            return super().dumps(obj)
+
+    def response(self, *args: Any, **kwargs: Any):
+        """Cria Response JSON a partir dos bytes gerados pelo orjson."""
+        if orjson is None:
+            return super().response(*args, **kwargs)
+
+        obj = self._prepare_response_obj(args, kwargs)
+        option = self._options()
+        if (self.compact is None and self._app.debug) or self.compact is False:
+            option |= orjson.OPT_INDENT_2
+
+        try:
+            body = orjson.dumps(obj, default=self.default, option=option)
+        except orjson.JSONEncodeError:
+            return super().response(*args, **kwargs)
+
+        return self._app.response_class(body + b"\n", mimetype=self.mimetype)
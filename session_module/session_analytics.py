@@ -14,7 +14,8 @@ Esta classe agora atua como FACADE, delegando para os componentes.
 
 Autor: Fábio Amado (2501444@estudante.uab.pt)
 """
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Set
+import threading
 from models.challenge import Challenge
 from strategies.score_calculator import ScoreCalculator
 from strategies.composite_scoring import CompositeScoringStrategy
@@ -44,6 +45,11 @@ class SessionAnalytics:
     - Depois: ~150 linhas, apenas coordenação
     """
 
+    # Máximo de interações genéricas diferidas por sessão antes de consolidar
+    PENDING_FLUSH_SIZE = 64
+    # Número de locks partilhados pelos utilizadores (potência de 2)
+    LOCK_STRIPES = 32
+
     def __init__(self):
         """Inicializa o sistema com componentes especializados."""
         # Componentes SRP
@@ -62,6 +68,19 @@ class SessionAnalytics:
             ])
         )
 
+        # Cache de relatórios/métricas de exportação por utilizador
+        # (invalidado em cada escrita desse utilizador)
+        self._report_cache: Dict[str, Dict] = {}
+        self._metrics_cache: Dict[str, Dict] = {}
+        # Utilizadores alterados desde a última exportação em massa
+        self._touched_users: Set[str] = set()
+        # Sessões com interações genéricas por consolidar
+        self._pending_sessions: Set[str] = set()
+
+        # Locks por utilizador (striped): utilizadores diferentes não se
+        # bloqueiam; reentrantes porque métodos públicos chamam-se entre si
+        self._locks = [threading.RLock() for _ in range(self.LOCK_STRIPES)]
+
     # =========================================================
     # PROPRIEDADES (Backward Compatibility)
     # =========================================================
@@ -78,7 +97,14 @@ class SessionAnalytics:
 
     @property
     def user_stats(self) -> Dict[str, Dict]:
-        """Acesso direto às stats (backward compatibility)."""
+        """
+        Acesso direto às stats (backward compatibility).
+
+        ATENÇÃO: as interações genéricas são consolidadas em lote, por
+        isso 'total_interactions' pode estar atrasado até
+        PENDING_FLUSH_SIZE - 1 eventos por sessão. Para valores
+        atualizados usar get_user_stats(user_id).
+        """
         return self._stats_calculator.user_stats
 
     # =========================================================
@@ -97,17 +123,22 @@ class SessionAnalytics:
         Returns:
             ID da sessão criada
         """
-        # Delegar para SessionManager
-        session_id = self._session_manager.create_session(user_id, session_id)
+        with self._lock(user_id):
+            # Delegar para SessionManager
+            session_id = self._session_manager.create_session(
+                user_id, session_id
+            )
 
-        # Inicializar stats do utilizador se necessário
-        self._stats_calculator.init_user_stats(user_id)
-        self._stats_calculator.increment_session_count(user_id)
+            # Inicializar stats do utilizador se necessário
+            self._stats_calculator.init_user_stats(user_id)
+            self._stats_calculator.increment_session_count(user_id)
 
-        # Atualizar dias consecutivos
-        self._streak_manager.update_consecutive_days(
-            self._stats_calculator.user_stats[user_id]
-        )
+            # Atualizar dias consecutivos
+            self._streak_manager.update_consecutive_days(
+                self._stats_calculator.user_stats[user_id]
+            )
+
+            self._invalidate(user_id)
 
         return session_id
 
@@ -121,14 +152,19 @@ class SessionAnalytics:
             challenge: Instância de Challenge
         """
         session = self._session_manager.get_session(session_id)
+        user_id = session['user_id']
 
-        # Delegar para EventTracker
-        self._event_tracker.log_challenge_start(session, challenge)
+        with self._lock(user_id):
+            self._flush(session)
 
-        # Atualizar stats do utilizador
-        user_id = session['user_id']
-        self._stats_calculator.increment_challenge_count(user_id)
-        self._stats_calculator.increment_interaction_count(user_id)
+            # Delegar para EventTracker
+            self._event_tracker.log_challenge_start(session, challenge)
+
+            # Atualizar stats do utilizador
+            self._stats_calculator.increment_challenge_count(user_id)
+            self._stats_calculator.increment_interaction_count(user_id)
+
+            self._invalidate(user_id)
 
     def log_challenge_complete(self, session_id: str,
                               challenge_id: str,
@@ -151,54 +187,54 @@ class SessionAnalytics:
         session = self._session_manager.get_session(session_id)
         user_id = session['user_id']
 
-        # Incrementar tentativas
-        attempts = self._event_tracker.increment_attempts(
-            session, challenge_id
-        )
-
-        # Encontrar tempo do desafio
-        start_interaction = self._event_tracker._find_challenge_start(
-            session, challenge_id
-        )
-
-        duration = 0
-        if start_interaction:
-            from datetime import datetime
-            duration = (
-                datetime.now() - start_interaction['start_time']
-            ).total_seconds()
-
-        # Calcular pontuação usando Strategy Pattern
-        scoring_context = {
-            'time_taken': duration,
-            'time_limit': time_limit or 30,
-            'is_correct': is_correct,
-            'attempts': attempts,
-            'difficulty': difficulty,
-            'streak': session['current_streak']
-        }
-        score_result = self.score_calculator.get_detailed_result(scoring_context)
-
-        # Registar evento de conclusão
-        self._event_tracker.log_challenge_complete(
-            session, challenge_id, is_correct, score_result
-        )
-
-        # Atualizar streak na sessão
-        current_streak = self._streak_manager.update_session_streak(
-            session, is_correct
-        )
-
-        # Armazenar score na sessão
-        session['scores'].append(score_result)
-        session['total_score'] += score_result['score']
-
-        # Atualizar stats do utilizador
-        self._stats_calculator.increment_interaction_count(user_id)
-        self._streak_manager.check_best_streak(
-            self._stats_calculator.user_stats[user_id],
-            current_streak
-        )
+        with self._lock(user_id):
+            self._flush(session)
+
+            # Incrementar tentativas
+            attempts = self._event_tracker.increment_attempts(
+                session, challenge_id
+            )
+
+            # Tempo do desafio: medido uma vez, usado na pontuação e no registo
+            duration = self._event_tracker.get_challenge_duration(
+                session, challenge_id
+            )
+
+            # Calcular pontuação usando Strategy Pattern
+            scoring_context = {
+                'time_taken': duration,
+                'time_limit': time_limit or 30,
+                'is_correct': is_correct,
+                'attempts': attempts,
+                'difficulty': difficulty,
+                'streak': session['current_streak']
+            }
+            score_result = self.score_calculator.get_detailed_result(
+                scoring_context
+            )
+
+            # Registar evento de conclusão
+            self._event_tracker.log_challenge_complete(
+                session, challenge_id, is_correct, score_result, duration
+            )
+
+            # Atualizar streak na sessão
+            current_streak = self._streak_manager.update_session_streak(
+                session, is_correct
+            )
+
+            # Armazenar score na sessão
+            session['scores'].append(score_result)
+            session['total_score'] += score_result['score']
+
+            # Atualizar stats do utilizador
+            self._stats_calculator.increment_interaction_count(user_id)
+            self._streak_manager.check_best_streak(
+                self._stats_calculator.user_stats[user_id],
+                current_streak
+            )
+
+            self._invalidate(user_id)
 
         return score_result
 
@@ -214,12 +250,18 @@ class SessionAnalytics:
             event_data: Dados adicionais
         """
         session = self._session_manager.get_session(session_id)
+        user_id = session['user_id']
 
-        # Delegar para EventTracker
-        self._event_tracker.log_interaction(session, event_type, event_data)
+        with self._lock(user_id):
+            # Delegar para EventTracker (stats atualizadas no flush)
+            pending = self._event_tracker.log_interaction(
+                session, event_type, event_data
+            )
+            self._pending_sessions.add(session_id)
+            if pending >= self.PENDING_FLUSH_SIZE:
+                self._flush(session)
 
-        # Atualizar stats
-        self._stats_calculator.increment_interaction_count(session['user_id'])
+            self._invalidate(user_id)
 
     def end_session(self, session_id: str) -> Dict:
         """
@@ -231,22 +273,30 @@ class SessionAnalytics:
         Returns:
             Sumário da sessão
         """
-        # Delegar terminação
-        session = self._session_manager.end_session(session_id)
+        user_id = self._session_manager.get_session(session_id)['user_id']
 
-        if not session['active']:  # Já estava inativa
-            return self.get_session_summary(session_id)
+        with self._lock(user_id):
+            # Consolidar interações pendentes antes de terminar
+            self._flush(self._session_manager.get_session(session_id))
 
-        # Atualizar stats do utilizador
-        user_id = session['user_id']
-        self._stats_calculator.update_play_time(user_id, session['duration'])
-        self._stats_calculator.update_score_stats(
-            user_id,
-            session['total_score'],
-            session['current_streak']
-        )
+            # Delegar terminação
+            session = self._session_manager.end_session(session_id)
+            self._invalidate(user_id)
+
+            if not session['active']:  # Já estava inativa
+                return self.get_session_summary(session_id)
 
-        return self.get_session_summary(session_id)
+            # Atualizar stats do utilizador
+            self._stats_calculator.update_play_time(
+                user_id, session['duration']
+            )
+            self._stats_calculator.update_score_stats(
+                user_id,
+                session['total_score'],
+                session['current_streak']
+            )
+
+            return self.get_session_summary(session_id)
 
     def get_session_summary(self, session_id: str) -> Dict:
         """
@@ -259,7 +309,10 @@ class SessionAnalytics:
             Sumário completo
         """
         session = self._session_manager.get_session(session_id)
-        return self._stats_calculator.calculate_session_summary(session)
+
+        with self._lock(session['user_id']):
+            self._flush(session)
+            return self._stats_calculator.calculate_session_summary(session)
 
     def get_user_sessions_report(self, user_id: str) -> Dict:
         """
@@ -271,14 +324,36 @@ class SessionAnalytics:
         Returns:
             Relatório agregado
         """
-        session_ids = self._session_manager.get_user_sessions(user_id)
-        sessions_data = [
-            self.get_session_summary(sid) for sid in session_ids
-        ]
+        with self._lock(user_id):
+            cached = self._report_cache.get(user_id)
+            if cached is not None:
+                return cached
+
+            session_ids = self._session_manager.get_user_sessions(user_id)
+            sessions_data = [
+                self.get_session_summary(sid) for sid in session_ids
+            ]
+
+            report = self._stats_calculator.calculate_user_report(
+                user_id, sessions_data
+            )
+            if user_id in self._stats_calculator.user_stats:
+                self._report_cache[user_id] = report
+            return report
+
+    def get_user_stats(self, user_id: str) -> Optional[Dict]:
+        """
+        Retorna estatísticas agregadas de um utilizador.
 
-        return self._stats_calculator.calculate_user_report(
-            user_id, sessions_data
-        )
+        Args:
+            user_id: ID do utilizador
+
+        Returns:
+            Estatísticas atualizadas, ou None se o utilizador não existe
+        """
+        with self._lock(user_id):
+            self._flush_user(user_id)
+            return self._stats_calculator.user_stats.get(user_id)
 
     def export_analytics(self, user_id: str) -> Dict:
         """
@@ -290,8 +365,62 @@ class SessionAnalytics:
         Returns:
             Dados formatados para Inven!RA
         """
-        user_stats = self._stats_calculator.user_stats.get(user_id)
-        return self._analytics_exporter.export_for_invenira(user_id, user_stats)
+        with self._lock(user_id):
+            metrics = self._metrics_cache.get(user_id)
+            if metrics is None:
+                self._flush_user(user_id)
+                user_stats = self._stats_calculator.user_stats.get(user_id)
+                metrics = self._analytics_exporter.build_metrics(user_stats)
+                if user_stats is not None:
+                    self._metrics_cache[user_id] = metrics
+
+            # Envelope (com timestamp) sempre gerado no momento da exportação
+            return self._analytics_exporter.wrap_export(user_id, metrics)
+
+    def export_all_analytics(self) -> List[Dict]:
+        """
+        Exporta analytics dos utilizadores alterados desde a última chamada.
+
+        Utilizadores sem novos eventos são ignorados; a sua última
+        exportação continua disponível em export_analytics (métricas em
+        cache, timestamp atual).
+
+        Returns:
+            Lista de dados formatados para Inven!RA
+        """
+        exports = []
+        for user_id in list(self._touched_users):
+            # Remover sob o lock do utilizador: uma escrita concorrente
+            # volta a marcá-lo e entra na próxima exportação
+            with self._lock(user_id):
+                self._touched_users.discard(user_id)
+                exports.append(self.export_analytics(user_id))
+        return exports
+
+    def _lock(self, user_id: str) -> threading.RLock:
+        """Lock da stripe que protege os dados de um utilizador."""
+        return self._locks[hash(user_id) & (self.LOCK_STRIPES - 1)]
+
+    def _flush(self, session: Dict) -> None:
+        """Consolida interações pendentes de uma sessão nas stats."""
+        flushed = self._event_tracker.flush_pending(session)
+        self._pending_sessions.discard(session['session_id'])
+        if flushed:
+            self._stats_calculator.bulk_add(
+                session['user_id'], {'total_interactions': flushed}
+            )
+
+    def _flush_user(self, user_id: str) -> None:
+        """Consolida interações pendentes de todas as sessões do utilizador."""
+        for sid in self._session_manager.get_user_sessions(user_id):
+            if sid in self._pending_sessions:
+                self._flush(self._session_manager.get_session(sid))
+
+    def _invalidate(self, user_id: str) -> None:
+        """Descarta relatórios em cache de um utilizador após escrita."""
+        self._report_cache.pop(user_id, None)
+        self._metrics_cache.pop(user_id, None)
+        self._touched_users.add(user_id)
 
 
 # Instância global (singleton para simplificar)
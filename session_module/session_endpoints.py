@@ -74,7 +74,7 @@ def register_session_routes(app):
 
         Body:
         {
-            "session_id": "student123_20241124120000",
+            "session_id": "student123_3f9a1c7e2b4d",
             "animal_id": 1,                    // inteiro, animal existente
             "challenge_type": "audio",         // opcional, default: "random"
             "difficulty": 1                    // opcional, 1-5, default: 1
@@ -130,7 +130,7 @@ def register_session_routes(app):
 
         Body:
         {
-            "session_id": "student123_20241124120000",
+            "session_id": "student123_3f9a1c7e2b4d",
             "challenge_id": "audio_1_4523",
             "is_correct": true,               // DEVE ser booleano
             "difficulty": 3,                  // opcional, 1-5
@@ -177,7 +177,7 @@ def register_session_routes(app):
 
         Body:
         {
-            "session_id": "student123_20241124120000",
+            "session_id": "student123_3f9a1c7e2b4d",
             "event_type": "click_hint",
             "event_data": {"element": "help_button"}  // opcional
         }
@@ -206,7 +206,7 @@ def register_session_routes(app):
 
         Body:
         {
-            "session_id": "student123_20241124120000"
+            "session_id": "student123_3f9a1c7e2b4d"
         }
 
         Returns:
@@ -283,14 +283,14 @@ def register_session_routes(app):
                 'error': 'user_id inválido'
             }), 400
 
-        if user_id not in session_analytics.user_stats:
+        stats = session_analytics.get_user_stats(user_id)
+
+        if stats is None:
             return jsonify({
                 'success': False,
                 'error': 'Utilizador não encontrado'
             }), 404
 
-        stats = session_analytics.user_stats[user_id]
-
         return jsonify({
             'success': True,
             'user_id': user_id,
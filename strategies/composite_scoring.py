@@ -48,14 +48,7 @@ class CompositeScoringStrategy(ScoringStrategy):
         Returns:
             Pontuação ponderada de 0 a 100
         """
-        total_score = 0.0
-
-        for strategy, weight in self.strategies:
-            score = strategy.calculate_score(context)
-            weighted_score = score * weight
-            total_score += weighted_score
-
-        return int(round(total_score))
+        return self.get_breakdown(context)['total_score']
 
     def get_strategy_name(self) -> str:
         """Retorna nome composto das estratégias"""
@@ -71,21 +64,26 @@ class CompositeScoringStrategy(ScoringStrategy):
 
         Returns:
             Dicionário com detalhes de cada estratégia
+
+        Cada estratégia é avaliada uma única vez; total_score é a soma
+        dos componentes ponderados (igual a calculate_score).
         """
-        breakdown = {
-            'total_score': self.calculate_score(context),
-            'components': []
-        }
+        total_score = 0.0
+        components = []
 
         for strategy, weight in self.strategies:
             score = strategy.calculate_score(context)
             weighted_score = score * weight
+            total_score += weighted_score
 
-            breakdown['components'].append({
+            components.append({
                 'strategy': strategy.get_strategy_name(),
                 'score': score,
                 'weight': weight,
                 'weighted_score': weighted_score
             })
 
-        return breakdown
+        return {
+            'total_score': int(round(total_score)),
+            'components': components
+        }
@@ -96,7 +96,15 @@ class ScoreCalculator:
         Returns:
             Dicionário com score, strategy, performance, etc.
         """
-        score = self.calculate(context)
+        # Se for CompositeScoringStrategy, o breakdown já inclui a
+        # pontuação total: evita avaliar as estratégias duas vezes
+        breakdown = None
+        if hasattr(self._strategy, 'get_breakdown'):
+            breakdown = self._strategy.get_breakdown(context)
+            score = breakdown['total_score']
+        else:
+            score = self.calculate(context)
+
         performance = self._strategy.get_performance_level(score)
 
         result = {
@@ -106,8 +114,7 @@ class ScoreCalculator:
             'context': context
         }
 
-        # Se for CompositeScoringStrategy, adicionar breakdown
-        if hasattr(self._strategy, 'get_breakdown'):
-            result['breakdown'] = self._strategy.get_breakdown(context)
+        if breakdown is not None:
+            result['breakdown'] = breakdown
 
         return result
@@ -241,13 +241,8 @@ class ChallengeCompleteRequest:
             raise ValueError(f"Sessão '{self.session_id}' não existe")
 
         session = session_analytics.sessions[self.session_id]
-        challenge_started = any(
-            i['type'] == 'challenge_start' and
-            i['challenge_id'] == self.challenge_id
-            for i in session['interactions']
-        )
 
-        if not challenge_started:
+        if self.challenge_id not in session['challenge_starts']:
             raise ValueError(
                 f"Desafio '{self.challenge_id}' não foi iniciado nesta sessão"
             )